@@ -5,8 +5,11 @@ from base import BaseFastAPI
 from celery.apps.beat import Beat
 from server.routes.router import router
 from server.settings import settings
-from server.tasks.pull_usa_jobs_to_elastic import \
-    process_and_store_historical_jobs
+from server.tasks.pull_usa_jobs_to_elastic import (
+    process_and_store_historical_jobs, replay_dead_letters)
+from server.tasks.snapshot_usa_jobs import (SnapshotSource,
+                                            export_jobs_snapshot,
+                                            restore_jobs_snapshot)
 from server.utils.celery import celery
 from server.utils.elasticsearch import elastic_client
 from typer import Typer
@@ -39,6 +42,24 @@ app.include_router(router, prefix=settings.API_VI_STR)
 @cli.command()
 def run_load_historical_jobs():
     asyncio.run(load_historical_jobs_dataset())
+
+
+@cli.command()
+def run_replay_dead_letters():
+    """Replays failed pages and documents from the dead-letter store"""
+    asyncio.run(replay_dead_letters())
+
+
+@cli.command()
+def run_export_jobs_snapshot(destination: str, source: SnapshotSource = SnapshotSource.ELASTIC):
+    """Writes the job corpus to Parquet files partitioned by posting month"""
+    asyncio.run(export_jobs_snapshot(destination, source))
+
+
+@cli.command()
+def run_restore_jobs_snapshot(source: str):
+    """Re-seeds the jobs index from a Parquet snapshot"""
+    asyncio.run(restore_jobs_snapshot(source))
     
 
 @cli.command()
@@ -0,0 +1,189 @@
+import csv
+import io
+import logging
+from datetime import date
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import orjson
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from server.schemas.jobs import (CoalescingStats, ExportFormat,
+                                 JobSearchResults)
+from server.settings import settings
+from server.utils.cache import build_redis_connection_args, get_redis_client
+from server.utils.constants import (ELASTIC_MAX_RESULT_WINDOW,
+                                    JOB_EXPORT_FIELDS, JOB_EXPORT_PAGE_SIZE,
+                                    SINGLEFLIGHT_METRICS_TIMEOUT,
+                                    USA_JOBS_INDEX)
+from server.utils.elasticsearch import (ElasticsearchJobIndexer,
+                                        build_jobs_query)
+from server.utils.exceptions import ObjectNotFound
+from server.utils.singleflight import SingleFlight
+
+from elasticsearch import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Shares one Elasticsearch call between identical concurrent searches of this worker,
+# counting coalesced calls in Redis across all workers
+_search_flight = SingleFlight(
+    "jobs-search",
+    redis=get_redis_client(
+        **build_redis_connection_args(),
+        decode_responses=True,
+        socket_timeout=SINGLEFLIGHT_METRICS_TIMEOUT,
+        socket_connect_timeout=SINGLEFLIGHT_METRICS_TIMEOUT,
+    ),
+)
+
+_EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _to_ndjson(jobs: List[Dict[str, Any]]) -> bytes:
+    """
+    Serialize a page of jobs to newline delimited JSON.
+
+    Arguments:
+        jobs: Page of job announcement dictionaries.
+
+    Returns:
+        bytes: One JSON document per line.
+    """
+    return b"".join(orjson.dumps(job) + b"\n" for job in jobs)
+
+
+def _to_csv(jobs: List[Dict[str, Any]], header: bool = False) -> bytes:
+    """
+    Serialize a page of jobs to CSV rows using the export columns.
+
+    Nested values such as locations are written as JSON strings.
+
+    Arguments:
+        jobs: Page of job announcement dictionaries.
+        header: Whether to write the header row first.
+
+    Returns:
+        bytes: UTF-8 encoded CSV rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=JOB_EXPORT_FIELDS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    for job in jobs:
+        writer.writerow({
+            field: orjson.dumps(value).decode() if isinstance(value, (dict, list)) else value
+            for field, value in job.items()
+        })
+    return buffer.getvalue().encode()
+
+
+async def _stream_jobs_export(
+    first_page: List[Dict[str, Any]],
+    pages: AsyncGenerator[List[Dict[str, Any]], None],
+    export_format: ExportFormat,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream the matching jobs one Elasticsearch page at a time.
+
+    Each chunk holds a whole page so the gzip middleware compresses
+    reasonably sized blocks while memory stays bounded by the page size.
+    A failure after the response has started is logged and re-raised so
+    the server aborts the connection instead of ending the body cleanly.
+
+    Arguments:
+        first_page: Page already fetched before the response started.
+        pages: Scan yielding the remaining pages.
+        export_format: Output serialization.
+
+    Yields:
+        bytes: Serialized page of jobs.
+    """
+    try:
+        if export_format == ExportFormat.CSV:
+            yield _to_csv(first_page, header=True)
+        elif first_page:
+            yield _to_ndjson(first_page)
+        async for jobs in pages:
+            if export_format == ExportFormat.CSV:
+                yield _to_csv(jobs)
+            else:
+                yield _to_ndjson(jobs)
+    except Exception:
+        logger.exception("Jobs export failed mid-stream, aborting the response.")
+        raise
+    finally:
+        await pages.aclose()
+
+
+@router.get("/search", response_model=JobSearchResults)
+async def search_jobs(
+    keyword: Optional[str] = None,
+    agency: Optional[str] = None,
+    posted_from: Optional[date] = None,
+    posted_to: Optional[date] = None,
+    page: int = Query(1, ge=1, le=ELASTIC_MAX_RESULT_WINDOW // settings.PAGINATION_PAGE_SIZE),
+) -> JobSearchResults:
+    """
+    Search jobs, coalescing identical concurrent requests into one Elasticsearch call.
+    """
+    query = build_jobs_query(
+        keyword=keyword,
+        agency=agency,
+        posted_from=posted_from.isoformat() if posted_from else None,
+        posted_to=posted_to.isoformat() if posted_to else None,
+    )
+    key = (orjson.dumps(query, option=orjson.OPT_SORT_KEYS), page)
+    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX)
+    results = await _search_flight.do(
+        key, lambda: elastic_client.search_jobs(query, page, settings.PAGINATION_PAGE_SIZE)
+    )
+    return JobSearchResults(NumberOfJobs=results["total"], Page=page, Jobs=results["jobs"])
+
+
+@router.get("/search/coalescing", response_model=CoalescingStats)
+async def search_coalescing_stats() -> CoalescingStats:
+    """
+    Report how often searches were coalesced across all workers.
+    """
+    return CoalescingStats(**await _search_flight.stats())
+
+
+@router.get("/export")
+async def export_jobs(
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    keyword: Optional[str] = None,
+    agency: Optional[str] = None,
+    posted_from: Optional[date] = None,
+    posted_to: Optional[date] = None,
+) -> StreamingResponse:
+    """
+    Stream every job matching the filters as NDJSON or CSV.
+    """
+    query = build_jobs_query(
+        keyword=keyword,
+        agency=agency,
+        posted_from=posted_from.isoformat() if posted_from else None,
+        posted_to=posted_to.isoformat() if posted_to else None,
+    )
+    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX)
+    pages = elastic_client.scan_jobs(
+        query=query, page_size=JOB_EXPORT_PAGE_SIZE, keep_alive=settings.ELASTIC_EXPORT_KEEP_ALIVE
+    )
+    # Open the point-in-time and fetch the first page before any byte is sent,
+    # so setup errors still get a proper status code
+    try:
+        first_page = await anext(pages)
+    except StopAsyncIteration:
+        first_page = []
+    except NotFoundError:
+        raise ObjectNotFound(f"Index '{USA_JOBS_INDEX}' does not exist.")
+    return StreamingResponse(
+        _stream_jobs_export(first_page, pages, export_format),
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{export_format.value}"'},
+    )
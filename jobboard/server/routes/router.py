@@ -1,3 +1,5 @@
 from fastapi import APIRouter
+from server.routes import jobs
 
 router = APIRouter()
+router.include_router(jobs.router)
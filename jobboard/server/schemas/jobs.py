@@ -1,4 +1,5 @@
-from typing import List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -18,4 +19,21 @@ class JobsSummary(BaseModel):
 class OrganizationsSummary(BaseModel):
     NumberOfJobs: int
     NumberOfOrganizations: int
-    OrganizationNames: List[OrganizationSummary]
\ No newline at end of file
+    OrganizationNames: List[OrganizationSummary]
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class JobSearchResults(BaseModel):
+    NumberOfJobs: int
+    Page: int
+    Jobs: List[Dict[str, Any]]
+
+
+class CoalescingStats(BaseModel):
+    Name: str
+    Calls: int
+    Executions: int
+    Coalesced: int
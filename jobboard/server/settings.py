@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     CACHE_SSL: Optional[bool] =  False
     ELASTIC_SSL: Optional[bool] = False
     PAGINATION_PAGE_SIZE: int = 20
+    ELASTIC_EXPORT_KEEP_ALIVE: str = "10m"
     JOB_API_KEY: str
     ADMIN_EMAIL: EmailStr
 
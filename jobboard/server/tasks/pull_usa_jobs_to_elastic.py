@@ -1,21 +1,75 @@
 import logging
+from asyncio import TimeoutError as AsyncTimeoutError
 from asyncio import get_event_loop, get_running_loop, run, set_event_loop
 from math import ceil
-from typing import Any, AsyncGenerator, Dict, List
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
 from pydantic import HttpUrl
 from server.settings import settings
 from server.utils.celery import celery
-from server.utils.constants import USA_JOBS_INDEX
-from server.utils.elasticsearch import ElasticsearchJobIndexer
+from server.utils.constants import (MAX_CONSECUTIVE_BATCH_FAILURES,
+                                    USA_JOBS_INDEX)
+from server.utils.dead_letter import DeadLetterKind, DeadLetterStore
+from server.utils.elasticsearch import (ElasticsearchJobIndexer,
+                                        build_elastic_client)
+from server.utils.exceptions import (USAJobClientManagementError,
+                                     USAManagementJsonError)
 from server.utils.usa_job_client import USAJobBoardClient
 
+# Failures of a single upstream page, dead-lettered instead of aborting the load.
+# aiohttp raises asyncio's TimeoutError, not a ClientError, on session timeouts.
+_PAGE_FETCH_ERRORS = (ClientError, AsyncTimeoutError, USAJobClientManagementError)
 
-async def fetch_usa_jobs_historical_data_by_batch() -> AsyncGenerator[List[Dict[str, Any]], None]:
+
+def _validate_page_response(response: Any, page: int) -> Dict[str, Any]:
+    """
+    Check that a historical jobs response holds a list of jobs.
+
+    Arguments:
+        response: Parsed response of the USAJobs API.
+        page: Page number of the response.
+
+    Returns:
+        Dict[str, Any]: The response.
+
+    Raises:
+        USAManagementJsonError: If the response has no list of jobs, e.g. a non-JSON body.
+    """
+    if not isinstance(response, dict) or not isinstance(response.get("data"), list):
+        raise USAManagementJsonError(f"Malformed response for historical jobs page {page}.")
+    return response
+
+
+async def fetch_historical_jobs_page(client: USAJobBoardClient, page: int, page_size: int) -> List[Dict[str, Any]]:
+    """
+    Fetch the job announcements of one historical page.
+
+    Arguments:
+        client: USAJobs API client.
+        page: Page number to fetch.
+        page_size: Number of results per page.
+
+    Returns:
+        List[Dict[str, Any]]: The job announcements of the page.
+
+    Raises:
+        USAManagementJsonError: If the response has no list of jobs, e.g. a non-JSON body.
+    """
+    response = await client.fetch_paginated_historical_job_announcements(page, page_size)
+    return _validate_page_response(response, page)["data"]
+
+
+async def fetch_usa_jobs_historical_data_by_batch(
+    dead_letters: Optional[DeadLetterStore] = None,
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
     """
     Fetch job announcements from the USAJobs API in batches.
 
+    Arguments:
+        dead_letters: Optional store recording pages that fail after retries,
+            which are then skipped instead of aborting the whole fetch.
+
     Yields:
         List[Dict[str, Any]]: A batch of job announcements.
     """
@@ -24,8 +78,13 @@ async def fetch_usa_jobs_historical_data_by_batch() -> AsyncGenerator[List[Dict[
     page_size = 1000
 
     # Fetch the first page to determine total pages
-    response = await client.fetch_paginated_historical_job_announcements(page, page_size)
-    total_count = response["paging"]["metadata"]["totalCount"]
+    response = _validate_page_response(
+        await client.fetch_paginated_historical_job_announcements(page, page_size), page
+    )
+    try:
+        total_count = int(response["paging"]["metadata"]["totalCount"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise USAManagementJsonError("Historical jobs page 1 has no paging metadata.") from e
     total_pages = ceil(total_count / page_size)
     logging.info("Fetching jobs data page 1")
     # Yield the first batch
@@ -34,26 +93,106 @@ async def fetch_usa_jobs_historical_data_by_batch() -> AsyncGenerator[List[Dict[
     # Fetch remaining pages and yield each batch
     for page in range(2, total_pages + 1):
         logging.info(f"Batching remaining job data page: {page}")
-        response = await client.fetch_paginated_historical_job_announcements(page, page_size)
-        yield response["data"]
+        try:
+            jobs = await fetch_historical_jobs_page(client, page, page_size)
+        except _PAGE_FETCH_ERRORS as e:
+            if dead_letters is None:
+                raise
+            await dead_letters.record_page(page, page_size, repr(e))
+            continue
+        yield jobs
 
 async def process_and_store_historical_jobs():
     """
     Process and store job announcements using the data fetched in batches.
+
+    The load stops after `MAX_CONSECUTIVE_BATCH_FAILURES` bulk requests fail
+    in a row, e.g. while Elasticsearch is down, rather than copying the
+    whole corpus into the dead-letter store.
+
+    Raises:
+        RuntimeError: If too many consecutive batches could not be indexed.
     """
-    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX)
-    # create index if it doesn't exist
-    logging.info(f"Creating elastic index: {USA_JOBS_INDEX}")
-    await elastic_client.create_index_if_not_exists()
-    async for job_batch in fetch_usa_jobs_historical_data_by_batch():
-        # Process the batching and indexingg elasticsearch
-        logging.info(f"Processing batch of {len(job_batch)} jobs.")
-        await elastic_client.bulk_index_jobs(job_batch)
-    # close elastic connection
-    await elastic_client.close()
-    
+    dead_letters = DeadLetterStore()
+    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX, dead_letters)
+    consecutive_failures = 0
+    try:
+        # create index if it doesn't exist
+        logging.info(f"Creating elastic index: {USA_JOBS_INDEX}")
+        await elastic_client.create_index_if_not_exists()
+        async for job_batch in fetch_usa_jobs_historical_data_by_batch(dead_letters):
+            # Process the batching and indexingg elasticsearch
+            logging.info(f"Processing batch of {len(job_batch)} jobs.")
+            if await elastic_client.bulk_index_jobs(job_batch):
+                consecutive_failures = 0
+                continue
+            consecutive_failures += 1
+            if consecutive_failures >= MAX_CONSECUTIVE_BATCH_FAILURES:
+                raise RuntimeError(
+                    f"Stopping the load after {consecutive_failures} consecutive failed bulk requests."
+                )
+    finally:
+        # close elastic and dead-letter connections
+        await elastic_client.close()
+        await dead_letters.close()
+
+
+async def replay_dead_letters():
+    """
+    Replay the failed pages and documents recorded in the dead-letter store.
+
+    Pages are fetched again and indexed; documents are indexed directly.
+    Replayed entries are removed, and anything failing again is recorded
+    afresh by the indexer. Pages that still cannot be fetched, and
+    rejections that could not be matched to a job, stay in place.
+
+    A dedicated Elasticsearch client is used and closed on every run, so
+    repeated runs from the same worker process never reuse a client bound
+    to a previous event loop.
+    """
+    client = USAJobBoardClient()
+    dead_letters = DeadLetterStore()
+    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX, dead_letters, es=build_elastic_client())
+    replayed = 0
+    try:
+        await elastic_client.create_index_if_not_exists()
+        async for entries in dead_letters.entries():
+            documents = []
+            replayed_ids = []
+            for entry_id, entry in entries:
+                payload = entry["payload"]
+                if entry["kind"] == DeadLetterKind.DOCUMENT.value:
+                    documents.append(payload)
+                    replayed_ids.append(entry_id)
+                    continue
+                if entry["kind"] == DeadLetterKind.REJECTION.value:
+                    logging.warning(f"Unmatched rejection {entry_id} needs manual inspection: {entry['error']}")
+                    continue
+                try:
+                    jobs = await fetch_historical_jobs_page(client, payload["page"], payload["page_size"])
+                except _PAGE_FETCH_ERRORS as e:
+                    logging.warning(f"Page {payload['page']} still failing, keeping it: {e!r}")
+                    continue
+                await elastic_client.bulk_index_jobs(jobs)
+                await dead_letters.remove(entry_id)
+                replayed += 1
+            if documents:
+                await elastic_client.bulk_index_jobs(documents)
+                await dead_letters.remove(*replayed_ids)
+                replayed += len(replayed_ids)
+        logging.info(f"Replayed {replayed} dead-letter entries.")
+    finally:
+        await elastic_client.close()
+        await dead_letters.close()
+
 
 @celery.task
 def load_daily_jobs():
     pass
+
+
+@celery.task
+def replay_failed_jobs():
+    """Replays failed pages and documents from the dead-letter store"""
+    run(replay_dead_letters())
         
\ No newline at end of file
@@ -0,0 +1,362 @@
+import json
+import logging
+import shutil
+from collections import defaultdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from server.tasks.pull_usa_jobs_to_elastic import \
+    fetch_usa_jobs_historical_data_by_batch
+from server.utils.constants import (JOB_POSTING_DATE_FIELD,
+                                    JOB_SNAPSHOT_PARTITION_KEY, USA_JOBS_INDEX)
+from server.utils.elasticsearch import ElasticsearchJobIndexer
+from server.utils.usa_job_client import normalize_datetime, parse_datetime
+
+logger = logging.getLogger(__name__)
+
+_UNKNOWN_PARTITION = "unknown"
+
+# Written last into a snapshot directory, restores refuse snapshots without it
+JOB_SNAPSHOT_SUCCESS_MARKER = "_SUCCESS"
+
+# Column holding, as JSON, every field that is not in the schema or does not fit its column type
+JOB_SNAPSHOT_EXTRA_FIELD = "_snapshot_extra"
+
+_STRING_FIELDS = [
+    "announcementNumber",
+    "positionTitle",
+    "hiringAgencyCode",
+    "hiringAgencyName",
+    "hiringDepartmentCode",
+    "hiringDepartmentName",
+    "hiringSubelementName",
+    "appointmentType",
+    "workSchedule",
+    "payScale",
+    "salaryType",
+    "serviceType",
+    "whoMayApply",
+    "travelRequirement",
+    "teleworkEligible",
+    "securityClearanceRequired",
+    "securityClearance",
+    "supervisoryStatus",
+    "drugTestRequired",
+    "relocationExpensesReimbursed",
+    "totalOpenings",
+    "positionOpeningStatus",
+    "minimumGrade",
+    "maximumGrade",
+    "promotionPotential",
+    "positionOpenDate",
+    "positionCloseDate",
+    "positionExpireDate",
+]
+
+JOB_SNAPSHOT_SCHEMA = pa.schema(
+    [
+        pa.field("usajobsControlNumber", pa.int64()),
+        pa.field("JobID", pa.string()),
+        *[pa.field(name, pa.string()) for name in _STRING_FIELDS],
+        pa.field("minimumSalary", pa.float64()),
+        pa.field("maximumSalary", pa.float64()),
+        pa.field("hiringPaths", pa.list_(pa.struct([("hiringPath", pa.string())]))),
+        pa.field("jobCategories", pa.list_(pa.struct([("series", pa.string())]))),
+        pa.field(
+            "positionLocations",
+            pa.list_(
+                pa.struct([
+                    ("positionLocationCity", pa.string()),
+                    ("positionLocationState", pa.string()),
+                    ("positionLocationCountry", pa.string()),
+                ])
+            ),
+        ),
+        pa.field(JOB_SNAPSHOT_EXTRA_FIELD, pa.string()),
+    ]
+)
+
+
+class SnapshotSource(str, Enum):
+    """
+    Where the job corpus is read from when writing a snapshot.
+    """
+
+    ELASTIC = "elastic"
+    INGEST = "ingest"
+
+
+def posting_month(job: Dict[str, Any]) -> str:
+    """
+    Derive the `YYYY-MM` partition value of a job from its posting date.
+
+    Arguments:
+        job: Job announcement dictionary.
+
+    Returns:
+        str: The posting month, or `unknown` when the date is missing or malformed.
+    """
+    value = job.get(JOB_POSTING_DATE_FIELD)
+    if not value:
+        return _UNKNOWN_PARTITION
+    try:
+        return normalize_datetime(parse_datetime(value)).strftime("%Y-%m")
+    except ValueError:
+        return _UNKNOWN_PARTITION
+
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def _fits(value: Any, data_type: pa.DataType) -> bool:
+    """
+    Tell whether a job value can be stored in a snapshot column unchanged.
+
+    Values are never converted: a string in a number column, a number in a
+    string column or an out of range integer does not fit, so a restore
+    writes back exactly what was exported.
+
+    Arguments:
+        value: Raw value from the job document.
+        data_type: Arrow type of the column.
+
+    Returns:
+        bool: True when the column holds the value as is.
+    """
+    if value is None:
+        return True
+    if pa.types.is_list(data_type):
+        return isinstance(value, list) and all(_fits(item, data_type.value_type) for item in value)
+    if pa.types.is_struct(data_type):
+        fields = [data_type.field(i) for i in range(data_type.num_fields)]
+        # Every key must be present, a missing one would come back as null
+        return (
+            isinstance(value, dict)
+            and set(value) == {field.name for field in fields}
+            and all(_fits(value[field.name], field.type) for field in fields)
+        )
+    if pa.types.is_int64(data_type):
+        return type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+    if pa.types.is_float64(data_type):
+        return type(value) is float
+    return isinstance(value, str)
+
+
+def normalize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a job into a row of the snapshot schema.
+
+    Fields outside the schema, top-level nulls, and values that do not fit
+    their column unchanged are kept as JSON in the extra column, so
+    `denormalize_job` gives back the original job.
+
+    Arguments:
+        job: Job announcement dictionary.
+
+    Returns:
+        Dict[str, Any]: Row matching `JOB_SNAPSHOT_SCHEMA`.
+    """
+    row: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    for name, value in job.items():
+        index = JOB_SNAPSHOT_SCHEMA.get_field_index(name)
+        if (
+            index != -1
+            and name != JOB_SNAPSHOT_EXTRA_FIELD
+            and value is not None
+            and _fits(value, JOB_SNAPSHOT_SCHEMA.field(index).type)
+        ):
+            row[name] = value
+        else:
+            extra[name] = value
+    # The standard json module keeps integers of any size, unlike orjson
+    row[JOB_SNAPSHOT_EXTRA_FIELD] = json.dumps(extra) if extra else None
+    return row
+
+
+def denormalize_job(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild a job document from a snapshot row.
+
+    Arguments:
+        row: Row read from a snapshot file.
+
+    Returns:
+        Dict[str, Any]: The job announcement dictionary.
+    """
+    extra = row.pop(JOB_SNAPSHOT_EXTRA_FIELD, None)
+    row.pop(JOB_SNAPSHOT_PARTITION_KEY, None)
+    job = {name: value for name, value in row.items() if value is not None}
+    if extra:
+        job.update(json.loads(extra))
+    return job
+
+
+class JobsSnapshotWriter:
+    """
+    Writes jobs to one Parquet file per `posting_month=YYYY-MM` partition.
+
+    Rows are buffered per partition and flushed to the partition's open
+    writer as row groups, so a scan in index order produces one file per
+    month instead of one small file per batch and month.
+    """
+
+    def __init__(self, destination: Path, row_group_size: int = 10_000, max_buffered_rows: int = 50_000):
+        self.destination = destination
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max_buffered_rows
+        self._buffers: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._buffered_rows = 0
+        self._writers: Dict[str, pq.ParquetWriter] = {}
+
+    def write(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Buffer a batch of jobs, flushing partitions that are full.
+
+        Arguments:
+            jobs: Batch of job announcement dictionaries.
+        """
+        for job in jobs:
+            month = posting_month(job)
+            self._buffers[month].append(normalize_job(job))
+            self._buffered_rows += 1
+            if len(self._buffers[month]) >= self.row_group_size:
+                self._flush(month)
+        if self._buffered_rows >= self.max_buffered_rows:
+            for month in list(self._buffers):
+                self._flush(month)
+
+    def _flush(self, month: str) -> None:
+        """
+        Write the buffered rows of a partition as one row group.
+
+        Arguments:
+            month: Partition to flush.
+        """
+        rows = self._buffers.pop(month, [])
+        if not rows:
+            return
+        writer = self._writers.get(month)
+        if writer is None:
+            partition_dir = self.destination / f"{JOB_SNAPSHOT_PARTITION_KEY}={month}"
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(
+                partition_dir / f"part-{uuid4().hex}.parquet", JOB_SNAPSHOT_SCHEMA, compression="zstd"
+            )
+            self._writers[month] = writer
+        writer.write_table(pa.Table.from_pylist(rows, schema=JOB_SNAPSHOT_SCHEMA))
+        self._buffered_rows -= len(rows)
+
+    def close(self) -> int:
+        """
+        Flush every partition and close the files.
+
+        Returns:
+            int: Number of files written.
+        """
+        for month in list(self._buffers):
+            self._flush(month)
+        for writer in self._writers.values():
+            writer.close()
+        return len(self._writers)
+
+
+async def _read_jobs_by_batch(
+    source: SnapshotSource, elastic_client: ElasticsearchJobIndexer
+) -> AsyncGenerator[List[Dict[str, Any]], None]:
+    """
+    Yield batches of jobs from the requested snapshot source.
+
+    Arguments:
+        source: Read from the Elasticsearch index or from the USAJobs ingest stream.
+        elastic_client: Indexer scanned when reading from Elasticsearch.
+
+    Yields:
+        List[Dict[str, Any]]: A batch of job announcements.
+    """
+    if source == SnapshotSource.INGEST:
+        async for job_batch in fetch_usa_jobs_historical_data_by_batch():
+            yield job_batch
+        return
+
+    async for job_batch in elastic_client.scan_jobs():
+        yield job_batch
+
+
+async def export_jobs_snapshot(destination: str, source: SnapshotSource = SnapshotSource.ELASTIC) -> None:
+    """
+    Export the job corpus to Parquet files partitioned by posting month.
+
+    The snapshot is written to a temporary sibling directory, marked with
+    `_SUCCESS` and renamed to `destination` only once the export completes,
+    so a failed export never leaves a partial snapshot behind.
+
+    Arguments:
+        destination: Root directory of the snapshot, must not exist or be empty.
+        source: Read from the Elasticsearch index or from the USAJobs ingest stream.
+
+    Raises:
+        FileExistsError: If `destination` is not empty.
+    """
+    root = Path(destination)
+    if root.exists() and any(root.iterdir()):
+        raise FileExistsError(f"Snapshot destination '{root}' is not empty.")
+    staging = root.with_name(f".{root.name}.partial-{uuid4().hex}")
+    staging.mkdir(parents=True)
+    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX)
+    writer = JobsSnapshotWriter(staging)
+    total_jobs = 0
+    try:
+        async for job_batch in _read_jobs_by_batch(source, elastic_client):
+            logger.info(f"Writing snapshot batch of {len(job_batch)} jobs.")
+            writer.write(job_batch)
+            total_jobs += len(job_batch)
+        total_files = writer.close()
+        (staging / JOB_SNAPSHOT_SUCCESS_MARKER).touch()
+        if root.exists():
+            root.rmdir()
+        staging.rename(root)
+    except BaseException:
+        logger.error(f"Snapshot export failed, discarding partial snapshot '{staging}'.")
+        writer.close()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        await elastic_client.close()
+    logger.info(f"Exported {total_jobs} jobs into {total_files} files under '{root}'.")
+
+
+async def restore_jobs_snapshot(source: str, batch_size: int = 1000) -> None:
+    """
+    Re-seed the jobs index from a Parquet snapshot.
+
+    Arguments:
+        source: Root directory of the snapshot.
+        batch_size: Number of rows read and bulk indexed at a time.
+
+    Raises:
+        FileNotFoundError: If `source` is not a completed snapshot.
+    """
+    root = Path(source)
+    if not (root / JOB_SNAPSHOT_SUCCESS_MARKER).is_file():
+        raise FileNotFoundError(f"'{root}' is not a completed snapshot, '{JOB_SNAPSHOT_SUCCESS_MARKER}' is missing.")
+    files = sorted(root.rglob("*.parquet"))
+    if not files:
+        logger.warning(f"No snapshot files found under '{root}'.")
+        return
+
+    elastic_client = ElasticsearchJobIndexer(USA_JOBS_INDEX)
+    logger.info(f"Creating elastic index: {USA_JOBS_INDEX}")
+    await elastic_client.create_index_if_not_exists()
+    try:
+        for path in files:
+            logger.info(f"Restoring snapshot file: {path}")
+            for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+                await elastic_client.bulk_index_jobs([denormalize_job(row) for row in record_batch.to_pylist()])
+    finally:
+        await elastic_client.close()
@@ -1,3 +1,48 @@
 SERVICE_PORT=8000
 
-USA_JOBS_INDEX="usa-jobs"
\ No newline at end of file
+USA_JOBS_INDEX="usa-jobs"
+
+# Field used to partition job snapshots by posting month
+JOB_POSTING_DATE_FIELD="positionOpenDate"
+
+JOB_SNAPSHOT_PARTITION_KEY="posting_month"
+
+# Columns written by the CSV jobs export, in order
+JOB_EXPORT_FIELDS=[
+    "usajobsControlNumber",
+    "announcementNumber",
+    "positionTitle",
+    "hiringAgencyCode",
+    "hiringAgencyName",
+    "hiringDepartmentCode",
+    "hiringDepartmentName",
+    "positionOpenDate",
+    "positionCloseDate",
+    "minimumGrade",
+    "maximumGrade",
+    "minimumSalary",
+    "maximumSalary",
+    "payScale",
+    "workSchedule",
+    "positionLocations",
+]
+
+JOB_EXPORT_PAGE_SIZE=1000
+
+# Redis stream holding failed pages and rejected documents for replay
+DEAD_LETTER_STREAM="usa-jobs:dead-letters"
+
+# Approximate cap on the dead-letter stream, the oldest entries are trimmed beyond it
+DEAD_LETTER_MAX_LENGTH=100000
+
+# Consecutive whole-batch indexing failures after which a load stops instead of dead-lettering everything
+MAX_CONSECUTIVE_BATCH_FAILURES=3
+
+# Default `index.max_result_window`, the deepest hit reachable with from/size paging
+ELASTIC_MAX_RESULT_WINDOW=10000
+
+# Redis hash prefix aggregating single-flight counters across workers
+SINGLEFLIGHT_METRICS_PREFIX="jobboard:singleflight"
+
+# Seconds before a single-flight metrics write or read to Redis gives up
+SINGLEFLIGHT_METRICS_TIMEOUT=1
@@ -0,0 +1,127 @@
+import logging
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+import orjson
+from redis.asyncio import Redis as AIORedis
+from server.utils.cache import build_redis_connection_args, get_redis_client
+from server.utils.constants import DEAD_LETTER_MAX_LENGTH, DEAD_LETTER_STREAM
+
+logger = logging.getLogger(__name__)
+
+
+class DeadLetterKind(str, Enum):
+    """
+    Type of item stored in the dead-letter stream.
+    """
+
+    PAGE = "page"
+    DOCUMENT = "document"
+    REJECTION = "rejection"
+
+
+class DeadLetterStore:
+    """
+    Redis stream of upstream pages and documents that failed to load.
+    """
+
+    def __init__(
+        self,
+        stream: str = DEAD_LETTER_STREAM,
+        redis: Optional[AIORedis] = None,
+        max_length: int = DEAD_LETTER_MAX_LENGTH,
+    ):
+        self.stream = stream
+        self.redis = redis or get_redis_client(**build_redis_connection_args(), decode_responses=True)
+        self.max_length = max_length
+
+    async def record(self, failures: List[Tuple[DeadLetterKind, Dict[str, Any], str]]) -> None:
+        """
+        Append failed items to the stream in one pipelined round trip.
+
+        The stream is trimmed to roughly `max_length` entries.
+
+        Arguments:
+            failures: Kind, replay payload and error description of each item.
+        """
+        if not failures:
+            return
+        failed_at = datetime.now(timezone.utc).isoformat()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for kind, payload, error in failures:
+                pipe.xadd(
+                    self.stream,
+                    {"kind": kind.value, "payload": orjson.dumps(payload), "error": error, "failed_at": failed_at},
+                    maxlen=self.max_length,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+    async def record_page(self, page: int, page_size: int, error: str) -> None:
+        """
+        Record an upstream page that could not be fetched.
+
+        Arguments:
+            page: Page number of the failed request.
+            page_size: Page size of the failed request.
+            error: Description of the failure.
+        """
+        logger.error(f"Dead-lettering page {page}: {error}")
+        await self.record([(DeadLetterKind.PAGE, {"page": page, "page_size": page_size}, error)])
+
+    async def record_documents(self, jobs: List[Dict[str, Any]], error: str) -> None:
+        """
+        Record job documents that Elasticsearch did not index for the same reason.
+
+        Arguments:
+            jobs: The failed job announcements.
+            error: Description of the failure.
+        """
+        await self.record([(DeadLetterKind.DOCUMENT, job, error) for job in jobs])
+
+    async def entries(self, batch_size: int = 100) -> AsyncGenerator[List[Tuple[str, Dict[str, Any]]], None]:
+        """
+        Iterate over the entries present when iteration starts.
+
+        Entries added while iterating, e.g. by a failing replay, are left for
+        the next run so a replay can never loop on its own failures.
+
+        Arguments:
+            batch_size: Number of entries read from Redis at a time.
+
+        Yields:
+            List[Tuple[str, Dict[str, Any]]]: Entry ids with their kind, payload and error.
+        """
+        last = await self.redis.xrevrange(self.stream, count=1)
+        if not last:
+            return
+        last_id = last[0][0]
+        start = "-"
+        while True:
+            batch = await self.redis.xrange(self.stream, min=start, max=last_id, count=batch_size)
+            if not batch:
+                return
+            yield [
+                (entry_id, {**fields, "payload": orjson.loads(fields["payload"])})
+                for entry_id, fields in batch
+            ]
+            if batch[-1][0] == last_id:
+                return
+            start = f"({batch[-1][0]}"
+
+    async def remove(self, *entry_ids: str) -> None:
+        """
+        Delete replayed entries from the stream.
+
+        Arguments:
+            entry_ids: Ids of the entries to delete.
+        """
+        if entry_ids:
+            await self.redis.xdel(self.stream, *entry_ids)
+
+    async def close(self) -> None:
+        """
+        Close the Redis connection.
+        """
+        await self.redis.aclose()
@@ -1,12 +1,64 @@
 import logging
+from collections import defaultdict
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from server.settings import settings
+from server.utils.constants import JOB_POSTING_DATE_FIELD
+from server.utils.dead_letter import DeadLetterKind, DeadLetterStore
 
 from elasticsearch import AsyncElasticsearch, NotFoundError, helpers
 
 logger = logging.getLogger(__name__)
 
-elastic_client = AsyncElasticsearch([f"http://{settings.ELASTIC_HOST}:{settings.ELASTIC_PORT}"], basic_auth=(settings.ELASTIC_USERNAME, settings.ELASTIC_PASSWORD),)
+
+
+def build_elastic_client() -> AsyncElasticsearch:
+    """
+    Create an Elasticsearch client from the settings.
+
+    Returns:
+        AsyncElasticsearch: A new client, bound to the event loop it is first used on.
+    """
+    return AsyncElasticsearch([f"http://{settings.ELASTIC_HOST}:{settings.ELASTIC_PORT}"], basic_auth=(settings.ELASTIC_USERNAME, settings.ELASTIC_PASSWORD),)
+
+
+elastic_client = build_elastic_client()
+
+
+def build_jobs_query(
+    keyword: Optional[str] = None,
+    agency: Optional[str] = None,
+    posted_from: Optional[str] = None,
+    posted_to: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build an Elasticsearch query from the job search filters.
+
+    Arguments:
+        keyword: Free text matched against the position title and agency.
+        agency: Exact hiring agency name.
+        posted_from: Earliest posting date, inclusive.
+        posted_to: Latest posting date, inclusive.
+
+    Returns:
+        Dict[str, Any]: The query clause, `match_all` when no filter is set.
+    """
+    must: List[Dict[str, Any]] = []
+    filters: List[Dict[str, Any]] = []
+    if keyword:
+        must.append({"multi_match": {"query": keyword, "fields": ["positionTitle", "hiringAgencyName"]}})
+    if agency:
+        filters.append({"term": {"hiringAgencyName.keyword": agency}})
+    if posted_from or posted_to:
+        date_range = {}
+        if posted_from:
+            date_range["gte"] = posted_from
+        if posted_to:
+            date_range["lte"] = posted_to
+        filters.append({"range": {JOB_POSTING_DATE_FIELD: date_range}})
+    if not must and not filters:
+        return {"match_all": {}}
+    return {"bool": {"must": must, "filter": filters}}
 
 
 class ElasticsearchJobIndexer:
@@ -14,9 +66,15 @@ class ElasticsearchJobIndexer:
     Class to handle indexing jobs into Elasticsearch.
     """
     
-    def __init__(self, index: str):
-        self.es = elastic_client
+    def __init__(
+        self,
+        index: str,
+        dead_letters: Optional[DeadLetterStore] = None,
+        es: Optional[AsyncElasticsearch] = None,
+    ):
+        self.es = es or elastic_client
         self.index = index
+        self.dead_letters = dead_letters
 
     async def create_index_if_not_exists(self) -> None:
         """
@@ -29,12 +87,18 @@ class ElasticsearchJobIndexer:
             await self.es.indices.create(index=self.index)
             logger.info(f"Index '{self.index}' created successfully.")
 
-    async def bulk_index_jobs(self, jobs: list[dict]) -> None:
+    async def bulk_index_jobs(self, jobs: list[dict]) -> bool:
         """
         Bulk index the job announcements into Elasticsearch.
 
+        Rejected jobs, or the whole batch when the request fails, are written
+        to the dead-letter store when one is configured.
+
         Arguments:
             jobs: List of job announcement dictionaries to index.
+
+        Returns:
+            bool: False when the whole bulk request failed.
         """
         actions = [
             {
@@ -46,10 +110,103 @@ class ElasticsearchJobIndexer:
         ]
 
         try:
-            response = await helpers.async_bulk(self.es, actions)
-            logger.info(f"Bulk indexed {len(jobs)} jobs successfully: {response}")
+            success, errors = await helpers.async_bulk(self.es, actions, raise_on_error=False)
+            logger.info(f"Bulk indexed {success} of {len(jobs)} jobs.")
         except Exception as e:
             logger.error(f"Failed to bulk index jobs: {str(e)}")
+            if self.dead_letters:
+                await self.dead_letters.record_documents(jobs, str(e))
+            return False
+
+        if errors:
+            logger.error(f"Elasticsearch rejected {len(errors)} jobs.")
+            if self.dead_letters:
+                # Elasticsearch returns ids as strings, and several jobs may share one
+                jobs_by_id = defaultdict(list)
+                for job in jobs:
+                    jobs_by_id[str(job.get("JobID", ""))].append(job)
+                failures = []
+                for error in errors:
+                    item = next(iter(error.values()))
+                    matches = jobs_by_id.get(str(item.get("_id", "")))
+                    if matches:
+                        failures.append((DeadLetterKind.DOCUMENT, matches.pop(0), str(item.get("error"))))
+                    else:
+                        failures.append((DeadLetterKind.REJECTION, item, str(item.get("error"))))
+                await self.dead_letters.record(failures)
+        return True
+
+    async def search_jobs(
+        self, query: Dict[str, Any], page: int = 1, page_size: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of jobs matching the query.
+
+        Arguments:
+            query: Elasticsearch query clause.
+            page: 1-based page number.
+            page_size: Number of jobs per page.
+
+        Returns:
+            Dict[str, Any]: The total number of matches and the jobs of the page.
+        """
+        response = await self.es.search(
+            index=self.index,
+            query=query,
+            from_=(page - 1) * page_size,
+            size=page_size,
+        )
+        return {
+            "total": response["hits"]["total"]["value"],
+            "jobs": [hit["_source"] for hit in response["hits"]["hits"]],
+        }
+
+    async def scan_jobs(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        page_size: int = 1000,
+        keep_alive: str = "2m",
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Scan the index page by page using a point-in-time and `search_after`.
+
+        Only one page of hits is held in memory at a time, and the point-in-time
+        gives a consistent view of the index for the whole scan.
+
+        Arguments:
+            query: Optional Elasticsearch query clause, defaults to `match_all`.
+            page_size: Number of documents fetched per page.
+            keep_alive: How long Elasticsearch keeps the point-in-time open between pages.
+
+        Yields:
+            List[Dict[str, Any]]: The `_source` of each document in a page.
+        """
+        pit = await self.es.open_point_in_time(index=self.index, keep_alive=keep_alive)
+        pit_id = pit["id"]
+        search_after = None
+        try:
+            while True:
+                response = await self.es.search(
+                    pit={"id": pit_id, "keep_alive": keep_alive},
+                    query=query or {"match_all": {}},
+                    sort=[{"_shard_doc": "asc"}],
+                    size=page_size,
+                    search_after=search_after,
+                    track_total_hits=False,
+                )
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+                if not hits:
+                    break
+                yield [hit["_source"] for hit in hits]
+                if len(hits) < page_size:
+                    break
+                search_after = hits[-1]["sort"]
+        finally:
+            try:
+                await self.es.close_point_in_time(id=pit_id)
+            except NotFoundError:
+                logger.warning(f"Point-in-time for index '{self.index}' already expired.")
 
     async def close(self):
         """
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from redis.asyncio import Redis as AIORedis
+from redis.exceptions import RedisError
+from server.utils.constants import SINGLEFLIGHT_METRICS_PREFIX
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("Calls", "Executions", "Coalesced")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one in-flight call.
+
+    The first caller for a key starts the call; every caller arriving while
+    it is still running awaits the same result instead of issuing its own.
+    When a Redis client is given, the counters are also aggregated in a Redis
+    hash so they cover every worker process. The client should have a socket
+    timeout so a hung Redis cannot hold a flush open indefinitely.
+    """
+
+    def __init__(self, name: str, redis: Optional[AIORedis] = None):
+        self.name = name
+        self.redis = redis
+        self.metrics_key = f"{SINGLEFLIGHT_METRICS_PREFIX}:{name}"
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._unflushed: Counter = Counter()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` for `key`, or join the call already in flight for it.
+
+        The shared call runs in its own task and is shielded, so a caller that
+        disconnects does not cancel the result for the others waiting on it.
+
+        Arguments:
+            key: Identifies calls that are interchangeable.
+            fn: Coroutine factory performing the actual call.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self._record("Executions")
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalesced {self.name} call for key: {key}")
+            self._record("Coalesced")
+        return await asyncio.shield(task)
+
+    def _record(self, counter: str) -> None:
+        """
+        Count a call locally and make sure a flush to Redis is scheduled.
+
+        Increments accumulate in memory and at most one flush runs at a time,
+        so a slow or hung Redis costs one pending task, not one per call.
+        Recording never delays or fails the call itself.
+
+        Arguments:
+            counter: Either `Executions` or `Coalesced`.
+        """
+        if self.redis is None:
+            return
+        self._unflushed["Calls"] += 1
+        self._unflushed[counter] += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush())
+
+    async def _flush(self) -> None:
+        """
+        Add the accumulated increments to the shared Redis hash.
+
+        Increments recorded while a write is in flight are sent by the next
+        loop iteration; on failure they are kept for the next flush.
+        """
+        while self._unflushed:
+            increments, self._unflushed = self._unflushed, Counter()
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for name, amount in increments.items():
+                        pipe.hincrby(self.metrics_key, name, amount)
+                    await pipe.execute()
+            except RedisError as e:
+                self._unflushed.update(increments)
+                logger.warning(f"Couldn't record {self.name} single-flight metrics: {e}")
+                return
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Counters describing how often calls were coalesced.
+
+        Returns:
+            Dict[str, Any]: Call, execution and coalescing counts across all
+            workers, or for this worker only when Redis is not configured or
+            unreachable.
+        """
+        counters = {"Calls": self.calls, "Executions": self.executions, "Coalesced": self.coalesced}
+        if self.redis is not None:
+            try:
+                shared = await self.redis.hgetall(self.metrics_key)
+                counters = {name: int(shared.get(name, 0)) for name in _COUNTERS}
+            except RedisError as e:
+                logger.warning(f"Couldn't read {self.name} single-flight metrics, reporting this worker only: {e}")
+        return {"Name": self.name, **counters}
@@ -0,0 +1,11 @@
+import os
+
+# Settings are read from the environment on import, provide defaults for the test run
+os.environ.setdefault("ELASTIC_HOST", "localhost")
+os.environ.setdefault("ELASTIC_PORT", "9200")
+os.environ.setdefault("ELASTIC_USERNAME", "elastic")
+os.environ.setdefault("ELASTIC_PASSWORD", "elastic")
+os.environ.setdefault("CACHE_HOST", "localhost")
+os.environ.setdefault("CACHE_PORT", "6379")
+os.environ.setdefault("JOB_API_KEY", "test-key")
+os.environ.setdefault("ADMIN_EMAIL", "admin@example.com")
@@ -0,0 +1,190 @@
+from asyncio import TimeoutError as AsyncTimeoutError
+
+import orjson
+import pytest
+from server.tasks import pull_usa_jobs_to_elastic
+from server.tasks.pull_usa_jobs_to_elastic import (
+    fetch_usa_jobs_historical_data_by_batch,
+    process_and_store_historical_jobs, replay_dead_letters)
+from server.utils.dead_letter import DeadLetterKind, DeadLetterStore
+from server.utils.elasticsearch import ElasticsearchJobIndexer, elastic_client
+from server.utils.exceptions import USAManagementJsonError
+
+
+def _entry(entry_id, kind, payload):
+    return entry_id, {"kind": kind, "payload": orjson.dumps(payload), "error": "boom"}
+
+
+@pytest.mark.asyncio
+async def test_entries_stop_at_last_entry_present_when_started(mocker):
+    redis = mocker.Mock()
+    redis.xrevrange = mocker.AsyncMock(return_value=[_entry("3-0", "page", {})])
+    redis.xrange = mocker.AsyncMock(side_effect=[
+        [_entry("1-0", "page", {"page": 2}), _entry("2-0", "document", {"JobID": "1"})],
+        [_entry("3-0", "page", {"page": 5})],
+    ])
+    store = DeadLetterStore(redis=redis)
+
+    batches = [batch async for batch in store.entries(batch_size=2)]
+
+    assert [[entry_id for entry_id, _ in batch] for batch in batches] == [["1-0", "2-0"], ["3-0"]]
+    assert batches[0][1][1]["payload"] == {"JobID": "1"}
+    assert redis.xrange.await_args_list == [
+        mocker.call(store.stream, min="-", max="3-0", count=2),
+        mocker.call(store.stream, min="(2-0", max="3-0", count=2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_entries_empty_stream(mocker):
+    redis = mocker.Mock()
+    redis.xrevrange = mocker.AsyncMock(return_value=[])
+    redis.xrange = mocker.AsyncMock()
+
+    assert [batch async for batch in DeadLetterStore(redis=redis).entries()] == []
+    redis.xrange.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_index_dead_letters_every_rejected_job(mocker):
+    jobs = [{"JobID": 7}, {"positionTitle": "a"}, {"positionTitle": "b"}, {"JobID": "8"}]
+    errors = [
+        {"index": {"_id": "7", "error": "mapping"}},
+        {"index": {"_id": "", "error": "empty id"}},
+        {"index": {"_id": "", "error": "empty id"}},
+        {"index": {"_id": "unknown", "error": "other"}},
+    ]
+    mocker.patch("server.utils.elasticsearch.helpers.async_bulk", mocker.AsyncMock(return_value=(1, errors)))
+    dead_letters = mocker.Mock()
+    dead_letters.record = mocker.AsyncMock()
+
+    assert await ElasticsearchJobIndexer("jobs", dead_letters).bulk_index_jobs(jobs)
+
+    dead_letters.record.assert_awaited_once_with([
+        (DeadLetterKind.DOCUMENT, jobs[0], "mapping"),
+        (DeadLetterKind.DOCUMENT, jobs[1], "empty id"),
+        (DeadLetterKind.DOCUMENT, jobs[2], "empty id"),
+        (DeadLetterKind.REJECTION, errors[3]["index"], "other"),
+    ])
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_request_dead_letters_batch_in_one_write(mocker):
+    jobs = [{"JobID": str(i)} for i in range(3)]
+    mocker.patch(
+        "server.utils.elasticsearch.helpers.async_bulk", mocker.AsyncMock(side_effect=ConnectionError("down"))
+    )
+    dead_letters = mocker.Mock()
+    dead_letters.record_documents = mocker.AsyncMock()
+
+    assert not await ElasticsearchJobIndexer("jobs", dead_letters).bulk_index_jobs(jobs)
+
+    dead_letters.record_documents.assert_awaited_once_with(jobs, "down")
+
+
+@pytest.mark.asyncio
+async def test_record_pipelines_bounded_stream_writes(mocker):
+    pipe = mocker.MagicMock()
+    pipe.__aenter__ = mocker.AsyncMock(return_value=pipe)
+    pipe.__aexit__ = mocker.AsyncMock(return_value=False)
+    pipe.execute = mocker.AsyncMock()
+    redis = mocker.Mock()
+    redis.pipeline.return_value = pipe
+    store = DeadLetterStore(redis=redis, max_length=10)
+
+    await store.record_documents([{"JobID": "1"}, {"JobID": "2"}], "down")
+
+    pipe.execute.assert_awaited_once()
+    assert pipe.xadd.call_count == 2
+    assert all(
+        call.kwargs == {"maxlen": 10, "approximate": True} for call in pipe.xadd.call_args_list
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_and_malformed_pages_are_dead_lettered(mocker):
+    responses = {
+        1: {"paging": {"metadata": {"totalCount": 4000}}, "data": [{"JobID": "1"}]},
+        2: AsyncTimeoutError(),
+        3: "<html>not json</html>",
+        4: {"data": [{"JobID": "4"}]},
+    }
+
+    async def fetch(self, page, page_size):
+        if isinstance(responses[page], Exception):
+            raise responses[page]
+        return responses[page]
+
+    mocker.patch.object(
+        pull_usa_jobs_to_elastic.USAJobBoardClient, "fetch_paginated_historical_job_announcements", fetch
+    )
+    dead_letters = mocker.Mock()
+    dead_letters.record_page = mocker.AsyncMock()
+
+    batches = [batch async for batch in fetch_usa_jobs_historical_data_by_batch(dead_letters)]
+
+    assert batches == [[{"JobID": "1"}], [{"JobID": "4"}]]
+    assert [call.args[:2] for call in dead_letters.record_page.await_args_list] == [(2, 1000), (3, 1000)]
+
+
+@pytest.mark.parametrize("response", ["<html>not json</html>", {"data": []}, {"paging": {}, "data": []}])
+@pytest.mark.asyncio
+async def test_malformed_first_page_raises_json_error(mocker, response):
+    mocker.patch.object(
+        pull_usa_jobs_to_elastic.USAJobBoardClient,
+        "fetch_paginated_historical_job_announcements",
+        mocker.AsyncMock(return_value=response),
+    )
+
+    with pytest.raises(USAManagementJsonError):
+        [batch async for batch in fetch_usa_jobs_historical_data_by_batch()]
+
+
+@pytest.mark.asyncio
+async def test_load_stops_after_consecutive_batch_failures(mocker):
+    async def batches(dead_letters):
+        for _ in range(10):
+            yield [{"JobID": "1"}]
+
+    mocker.patch.object(pull_usa_jobs_to_elastic, "fetch_usa_jobs_historical_data_by_batch", batches)
+    store = mocker.Mock()
+    store.close = mocker.AsyncMock()
+    mocker.patch.object(pull_usa_jobs_to_elastic, "DeadLetterStore", return_value=store)
+    mocker.patch.object(ElasticsearchJobIndexer, "create_index_if_not_exists", mocker.AsyncMock())
+    bulk_index_jobs = mocker.patch.object(
+        ElasticsearchJobIndexer, "bulk_index_jobs", mocker.AsyncMock(side_effect=[False, True, False, False, False])
+    )
+    close = mocker.patch.object(ElasticsearchJobIndexer, "close", mocker.AsyncMock())
+
+    with pytest.raises(RuntimeError):
+        await process_and_store_historical_jobs()
+
+    assert bulk_index_jobs.await_count == 5
+    close.assert_awaited_once()
+    store.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_replay_uses_and_closes_its_own_elastic_client(mocker):
+    es = mocker.Mock()
+    es.close = mocker.AsyncMock()
+    mocker.patch.object(pull_usa_jobs_to_elastic, "build_elastic_client", return_value=es)
+    store = mocker.Mock()
+    store.close = mocker.AsyncMock()
+    store.remove = mocker.AsyncMock()
+
+    async def entries():
+        yield [("1-0", {"kind": "document", "payload": {"JobID": "1"}, "error": "boom"})]
+
+    store.entries = entries
+    mocker.patch.object(pull_usa_jobs_to_elastic, "DeadLetterStore", return_value=store)
+    mocker.patch.object(ElasticsearchJobIndexer, "create_index_if_not_exists", mocker.AsyncMock())
+    bulk_index_jobs = mocker.patch.object(ElasticsearchJobIndexer, "bulk_index_jobs", mocker.AsyncMock())
+    close_shared = mocker.patch.object(elastic_client, "close", mocker.AsyncMock())
+
+    await replay_dead_letters()
+
+    bulk_index_jobs.assert_awaited_once_with([{"JobID": "1"}])
+    store.remove.assert_awaited_once_with("1-0")
+    es.close.assert_awaited_once()
+    close_shared.assert_not_awaited()
@@ -0,0 +1,107 @@
+import csv
+import io
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from manage import app
+from server.routes.jobs import _to_csv
+from server.utils.constants import JOB_EXPORT_FIELDS
+from server.utils.elasticsearch import build_jobs_query
+
+from elasticsearch import NotFoundError
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def _scan(pages):
+    async def scan_jobs(self, **kwargs):
+        for page in pages:
+            yield page
+    return scan_jobs
+
+
+def test_build_jobs_query_match_all_without_filters():
+    assert build_jobs_query() == {"match_all": {}}
+
+
+def test_build_jobs_query_combines_filters():
+    query = build_jobs_query(keyword="nurse", agency="Veterans Health Administration", posted_from="2020-01-01")
+
+    assert query["bool"]["must"] == [
+        {"multi_match": {"query": "nurse", "fields": ["positionTitle", "hiringAgencyName"]}}
+    ]
+    assert query["bool"]["filter"] == [
+        {"term": {"hiringAgencyName.keyword": "Veterans Health Administration"}},
+        {"range": {"positionOpenDate": {"gte": "2020-01-01"}}},
+    ]
+
+
+def test_to_csv_header_only_when_requested():
+    jobs = [{"positionTitle": "Clerk", "positionLocations": [{"positionLocationCity": "Denver"}], "other": 1}]
+
+    with_header = list(csv.reader(io.StringIO(_to_csv(jobs, header=True).decode())))
+    without_header = list(csv.reader(io.StringIO(_to_csv(jobs).decode())))
+
+    assert with_header[0] == JOB_EXPORT_FIELDS
+    assert without_header == with_header[1:]
+    row = dict(zip(JOB_EXPORT_FIELDS, without_header[0]))
+    assert row["positionTitle"] == "Clerk"
+    assert orjson.loads(row["positionLocations"]) == [{"positionLocationCity": "Denver"}]
+
+
+def test_export_streams_every_page_as_ndjson(client, mocker):
+    pages = [[{"JobID": "1"}, {"JobID": "2"}], [{"JobID": "3"}]]
+    mocker.patch("server.routes.jobs.ElasticsearchJobIndexer.scan_jobs", _scan(pages))
+
+    response = client.get("/api/jobboard/v1/jobs/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line) for line in response.text.splitlines()] == [
+        {"JobID": "1"}, {"JobID": "2"}, {"JobID": "3"}
+    ]
+
+
+def test_export_csv_writes_header_for_empty_result(client, mocker):
+    mocker.patch("server.routes.jobs.ElasticsearchJobIndexer.scan_jobs", _scan([]))
+
+    response = client.get("/api/jobboard/v1/jobs/export", params={"export_format": "csv"})
+
+    assert response.status_code == 200
+    assert response.text.strip() == ",".join(JOB_EXPORT_FIELDS)
+
+
+def test_export_missing_index_returns_not_found(client, mocker):
+    async def scan_jobs(self, **kwargs):
+        raise NotFoundError("index_not_found_exception", mocker.Mock(status=404), {})
+        yield
+
+    mocker.patch("server.routes.jobs.ElasticsearchJobIndexer.scan_jobs", scan_jobs)
+
+    response = client.get("/api/jobboard/v1/jobs/export")
+
+    assert response.status_code == 404
+
+
+def test_export_aborts_on_mid_stream_failure(client, mocker):
+    async def scan_jobs(self, **kwargs):
+        yield [{"JobID": "1"}]
+        raise RuntimeError("point-in-time expired")
+
+    mocker.patch("server.routes.jobs.ElasticsearchJobIndexer.scan_jobs", scan_jobs)
+
+    # The error reaches the server instead of ending the body cleanly
+    with pytest.raises(BaseExceptionGroup) as exc_info:
+        client.get("/api/jobboard/v1/jobs/export")
+
+    assert exc_info.group_contains(RuntimeError, match="point-in-time expired")
+
+
+def test_search_rejects_pages_beyond_result_window(client):
+    response = client.get("/api/jobboard/v1/jobs/search", params={"page": 10_000})
+
+    assert response.status_code == 422
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from server.utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight("test")
+    executions = 0
+
+    async def call():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return executions
+
+    results = await asyncio.gather(*[flight.do("key", call) for _ in range(5)])
+
+    assert results == [1] * 5
+    assert await flight.stats() == {"Name": "test", "Calls": 5, "Executions": 1, "Coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    flight = SingleFlight("test")
+
+    async def call(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(flight.do("a", lambda: call("a")), flight.do("b", lambda: call("b")))
+
+    assert results == ["a", "b"]
+    assert flight.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_caller_and_key_is_released():
+    flight = SingleFlight("test")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*[flight.do("key", failing) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight._in_flight == {}
+
+    async def succeeding():
+        return "ok"
+
+    assert await flight.do("key", succeeding) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight("test")
+
+    async def call():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    leader = asyncio.create_task(flight.do("key", call))
+    follower = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == "done"
+
+
+@pytest.mark.asyncio
+async def test_stats_read_from_redis(mocker):
+    redis = mocker.Mock()
+    redis.hgetall = mocker.AsyncMock(return_value={"Calls": "10", "Executions": "4", "Coalesced": "6"})
+    flight = SingleFlight("test", redis=redis)
+
+    assert await flight.stats() == {"Name": "test", "Calls": 10, "Executions": 4, "Coalesced": 6}
+    redis.hgetall.assert_awaited_once_with("jobboard:singleflight:test")
+
+
+@pytest.mark.asyncio
+async def test_stats_fall_back_to_worker_counters_when_redis_fails(mocker):
+    redis = mocker.Mock()
+    redis.hgetall = mocker.AsyncMock(side_effect=RedisConnectionError("down"))
+    flight = SingleFlight("test", redis=redis)
+    flight.calls, flight.executions, flight.coalesced = 3, 1, 2
+
+    assert await flight.stats() == {"Name": "test", "Calls": 3, "Executions": 1, "Coalesced": 2}
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.increments = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def hincrby(self, key, field, amount):
+        self.increments.append((field, amount))
+
+    async def execute(self):
+        self.redis.pipelines += 1
+        await self.redis.release.wait()
+        if self.redis.error:
+            raise self.redis.error
+        for field, amount in self.increments:
+            self.redis.hash[field] = self.redis.hash.get(field, 0) + amount
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hash = {}
+        self.pipelines = 0
+        self.error = None
+        self.release = asyncio.Event()
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_flushed_in_batches_one_at_a_time():
+    redis = _FakeRedis()
+    flight = SingleFlight("test", redis=redis)
+
+    async def call():
+        return "ok"
+
+    for _ in range(50):
+        await flight.do("key", call)
+
+    # Redis is hung: the first flush is pending, later calls only count locally
+    assert redis.pipelines == 1
+    redis.release.set()
+    await flight._flush_task
+
+    assert redis.pipelines == 2
+    assert redis.hash == {"Calls": 50, "Executions": 50}
+
+
+@pytest.mark.asyncio
+async def test_metrics_kept_for_next_flush_when_redis_fails():
+    redis = _FakeRedis()
+    redis.error = RedisConnectionError("down")
+    redis.release.set()
+    flight = SingleFlight("test", redis=redis)
+
+    async def call():
+        return "ok"
+
+    await flight.do("key", call)
+    await flight._flush_task
+    assert redis.hash == {}
+
+    redis.error = None
+    await flight.do("key", call)
+    await flight._flush_task
+
+    assert redis.hash == {"Calls": 2, "Executions": 2}
@@ -0,0 +1,150 @@
+import json
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+from server.tasks import snapshot_usa_jobs
+from server.tasks.snapshot_usa_jobs import (JOB_SNAPSHOT_EXTRA_FIELD,
+                                            JOB_SNAPSHOT_SCHEMA,
+                                            JOB_SNAPSHOT_SUCCESS_MARKER,
+                                            JobsSnapshotWriter,
+                                            denormalize_job,
+                                            export_jobs_snapshot,
+                                            normalize_job, posting_month,
+                                            restore_jobs_snapshot)
+
+
+def _canonical(job):
+    return json.dumps(job, sort_keys=True)
+
+
+def test_posting_month_from_open_date():
+    assert posting_month({"positionOpenDate": "2016-12-05T00:00:00"}) == "2016-12"
+    assert posting_month({"positionOpenDate": "2020-01-31T23:00:00Z"}) == "2020-01"
+
+
+def test_posting_month_unknown_when_missing_or_malformed():
+    assert posting_month({}) == "unknown"
+    assert posting_month({"positionOpenDate": "05/12/2016"}) == "unknown"
+
+
+def test_normalize_job_keeps_matching_values_in_columns():
+    job = {
+        "usajobsControlNumber": 123,
+        "positionTitle": "Analyst",
+        "minimumSalary": 50000.5,
+        "positionLocations": [
+            {"positionLocationCity": "Denver", "positionLocationState": "CO", "positionLocationCountry": "US"}
+        ],
+    }
+
+    row = normalize_job(job)
+
+    assert row["usajobsControlNumber"] == 123
+    assert row["positionLocations"] == job["positionLocations"]
+    assert row[JOB_SNAPSHOT_EXTRA_FIELD] is None
+    assert denormalize_job(row) == job
+
+
+@pytest.mark.parametrize("job", [
+    {"usajobsControlNumber": "00123"},
+    {"usajobsControlNumber": 2**70},
+    {"usajobsControlNumber": 12.0},
+    {"usajobsControlNumber": True},
+    {"totalOpenings": 3},
+    {"minimumSalary": 50000},
+    {"maximumSalary": "not a number"},
+    {"positionTitle": None},
+    {"positionLocations": [{"positionLocationCity": "Denver"}]},
+    {"hiringPaths": [{"hiringPath": 1}]},
+    {"_links": [{"rel": "self"}], "teleworkEligible": False},
+])
+def test_normalize_job_round_trips_mismatched_values(job):
+    row = normalize_job(job)
+
+    assert set(row) == {JOB_SNAPSHOT_EXTRA_FIELD}
+    assert denormalize_job(row) == job
+    assert all(type(denormalize_job(normalize_job(job))[name]) is type(value) for name, value in job.items())
+
+
+def test_writer_produces_one_readable_dataset(tmp_path):
+    jobs = [
+        {"positionOpenDate": "2016-12-05T00:00:00", "usajobsControlNumber": 1},
+        {"positionOpenDate": "2017-01-05T00:00:00", "positionTitle": "Clerk"},
+        {"positionOpenDate": "2016-12-06T00:00:00", "minimumSalary": "10", "usajobsControlNumber": 2**70},
+        {"positionTitle": "No date", "positionLocations": [{"positionLocationCity": "Denver"}]},
+    ]
+    writer = JobsSnapshotWriter(tmp_path, row_group_size=2)
+    writer.write(jobs[:2])
+    writer.write(jobs[2:])
+
+    assert writer.close() == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "posting_month=2016-12",
+        "posting_month=2017-01",
+        "posting_month=unknown",
+    ]
+    for path in tmp_path.rglob("*.parquet"):
+        assert pq.read_schema(path).equals(JOB_SNAPSHOT_SCHEMA, check_metadata=False)
+
+    table = ds.dataset(tmp_path, format="parquet", partitioning="hive").to_table()
+    assert table.num_rows == len(jobs)
+    assert sorted(table.column("posting_month").to_pylist()) == ["2016-12", "2016-12", "2017-01", "unknown"]
+    restored = [denormalize_job(row) for row in table.to_pylist()]
+    assert sorted(restored, key=_canonical) == sorted(jobs, key=_canonical)
+
+
+def _source(batches):
+    async def read_jobs_by_batch(source, elastic_client):
+        for batch in batches:
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    return read_jobs_by_batch
+
+
+@pytest.fixture
+def elastic_close(mocker):
+    return mocker.patch.object(snapshot_usa_jobs.ElasticsearchJobIndexer, "close", mocker.AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_export_marks_completed_snapshot(tmp_path, mocker, elastic_close):
+    jobs = [{"positionOpenDate": "2016-12-05T00:00:00", "usajobsControlNumber": 1}]
+    mocker.patch.object(snapshot_usa_jobs, "_read_jobs_by_batch", _source([jobs]))
+    destination = tmp_path / "snapshot"
+
+    await export_jobs_snapshot(str(destination))
+
+    assert (destination / JOB_SNAPSHOT_SUCCESS_MARKER).is_file()
+    assert len(list(destination.rglob("*.parquet"))) == 1
+    assert [path.name for path in tmp_path.iterdir()] == ["snapshot"]
+
+
+@pytest.mark.asyncio
+async def test_failed_export_leaves_no_snapshot(tmp_path, mocker, elastic_close):
+    jobs = [{"positionOpenDate": "2016-12-05T00:00:00"}]
+    mocker.patch.object(snapshot_usa_jobs, "_read_jobs_by_batch", _source([jobs, RuntimeError("scan failed")]))
+
+    with pytest.raises(RuntimeError):
+        await export_jobs_snapshot(str(tmp_path / "snapshot"))
+
+    assert list(tmp_path.iterdir()) == []
+    elastic_close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_export_refuses_non_empty_destination(tmp_path, elastic_close):
+    (tmp_path / "old.parquet").touch()
+
+    with pytest.raises(FileExistsError):
+        await export_jobs_snapshot(str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_restore_refuses_incomplete_snapshot(tmp_path):
+    (tmp_path / "posting_month=2016-12").mkdir()
+    (tmp_path / "posting_month=2016-12" / "part-1.parquet").touch()
+
+    with pytest.raises(FileNotFoundError):
+        await restore_jobs_snapshot(str(tmp_path))